@@ -0,0 +1,132 @@
+import time
+import queue
+import random
+import itertools
+import collections
+import multiprocessing
+from generateMap import IARCMapGenerator
+
+# Per-tolerance summary of one solved map
+ToleranceResult = collections.namedtuple('ToleranceResult', ['score', 'width', 'violations', 'path_length', 'sacrificed_count'])
+
+# One record per map; grids, fields and paths are dropped once the record is built
+MapResult = collections.namedtuple('MapResult', ['index', 'params', 'tolerances', 'generate_time', 'solve_time'])
+
+# Keys of a parameter dict that are forwarded to generate_base_map
+MAP_PARAMS = ('num_trees', 'num_mines', 'hidden_rate', 'safe_buffer_size')
+
+# Generator owned by each worker process, reused across all of its maps
+_worker_gen = None
+
+
+def evaluate_map(map_gen, index, params, solve_kwargs=None):
+    """
+    Generates and solves one map on an existing generator.
+
+    Parameters:
+      map_gen: IARCMapGenerator reused between calls.
+      index: Position of params in the input, echoed in the result.
+      params: dict with any of num_trees, num_mines, hidden_rate,
+              safe_buffer_size, plus an optional 'seed' for reproducible maps.
+      solve_kwargs: Extra keyword arguments for solve_all_scenarios.
+
+    Returns:
+      A MapResult.
+    """
+    if params.get('seed') is not None:
+        random.seed(params['seed'])
+
+    t0 = time.perf_counter()
+    map_gen.generate_base_map(**{k: params[k] for k in MAP_PARAMS if k in params})
+    t1 = time.perf_counter()
+    solutions = map_gen.solve_all_scenarios(**(solve_kwargs or {}))
+    t2 = time.perf_counter()
+
+    tolerances = []
+    for t in sorted(solutions):
+        sol = solutions[t]
+        tolerances.append(ToleranceResult(
+            score=sol['score'],
+            width=sol['width'],
+            violations=map_gen.count_path_violations(sol['path'], sol['width']),
+            path_length=len(sol['path']),
+            sacrificed_count=len(sol['sacrificed'])
+        ))
+
+    return MapResult(index, params, tuple(tolerances), t1 - t0, t2 - t1)
+
+
+def _init_worker():
+    global _worker_gen
+    _worker_gen = IARCMapGenerator()
+
+
+def _worker_chunk(chunk):
+    return [evaluate_map(_worker_gen, index, params, solve_kwargs) for index, params, solve_kwargs in chunk]
+
+
+def evaluate_maps(param_iter, processes=None, ordered=True, chunksize=8, **solve_kwargs):
+    """
+    Streams MapResult records for every parameter dict in param_iter.
+
+    Parameters:
+      param_iter: Iterable of parameter dicts (see evaluate_map); consumed lazily.
+      processes: Worker count. None or 1 runs in this process.
+      ordered: Yield results in input order; False yields them as they finish.
+      chunksize: Maps sent to a worker at a time.
+      solve_kwargs: Forwarded to solve_all_scenarios (mode, time_budget, ...).
+
+    Yields:
+      MapResult records.
+    """
+    if not processes or processes == 1:
+        map_gen = IARCMapGenerator()
+        for index, params in enumerate(param_iter):
+            yield evaluate_map(map_gen, index, params, solve_kwargs)
+        return
+
+    tasks = ((index, params, solve_kwargs) for index, params in enumerate(param_iter))
+    chunks = iter(lambda: list(itertools.islice(tasks, chunksize)), [])
+    # At most this many chunks are queued, running or waiting to be yielded in order,
+    # so huge parameter streams are never fully queued; one is topped up per chunk yielded
+    max_chunks = processes * 4
+
+    finished = queue.Queue()
+    in_flight = 0
+    submitted = 0
+    next_chunk = 0
+    held = {}  # chunk number -> records finished ahead of an earlier chunk (ordered only)
+
+    with multiprocessing.Pool(processes, initializer=_init_worker) as pool:
+        def submit():
+            nonlocal in_flight, submitted
+            chunk = next(chunks, None)
+            if chunk is None: return False
+            number = submitted
+            pool.apply_async(_worker_chunk, (chunk,),
+                             callback=lambda records: finished.put((number, records, None)),
+                             error_callback=lambda error: finished.put((number, None, error)))
+            in_flight += 1
+            submitted += 1
+            return True
+
+        while in_flight < max_chunks and submit():
+            pass
+
+        while in_flight:
+            number, records, error = finished.get()
+            in_flight -= 1
+            if error is not None:
+                raise error
+
+            if not ordered:
+                submit()
+                yield from records
+                continue
+
+            held[number] = records
+            while next_chunk in held:
+                records = held.pop(next_chunk)
+                next_chunk += 1
+                submit()
+                yield from records
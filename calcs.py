@@ -2,6 +2,7 @@ import math
 import colorsys
 import random
 import numpy as np
+from collections import deque
 
 
 def createRadialGradientSurface(pygame, finalSize=(512, 512), circularSmoothnessSteps=3, starterSize=(3, 3), baseColor=(0, 0, 0, 200), centerColor=(180, 30, 255, 255)):
@@ -52,6 +53,25 @@ def createRadialGradientSurface(pygame, finalSize=(512, 512), circularSmoothness
     return tempSurface
 
 
+# (finalSize, circularSmoothnessSteps, starterSize, baseColor, centerColor) -> pygame.Surface
+_gradientCache = {}
+
+
+def getRadialGradientSurface(pygame, finalSize=(512, 512), circularSmoothnessSteps=3, starterSize=(3, 3), baseColor=(0, 0, 0, 200), centerColor=(180, 30, 255, 255)):
+    """
+    Memoized createRadialGradientSurface; each parameter set is built once.
+    The returned surface is shared, so copy() it before drawing onto it.
+    """
+    key = (tuple(finalSize), circularSmoothnessSteps, tuple(starterSize), tuple(baseColor), tuple(centerColor))
+    if key not in _gradientCache:
+        _gradientCache[key] = createRadialGradientSurface(pygame, finalSize, circularSmoothnessSteps, starterSize, baseColor, centerColor)
+    return _gradientCache[key]
+
+
+def clearAssetCache():
+    _gradientCache.clear()
+
+
 def drawRoundedLine(pygame, s, p1, p2, c, w):
     p1v = pygame.math.Vector2(p1)
     p2v = pygame.math.Vector2(p2)
@@ -136,6 +156,57 @@ def linearGradient(colors, normalizedZero2One):
     return [(int(colors[index][i] + percent * (colors[index + 1][i] - colors[index][i]))) for i in range(3)]
 
 
+def linearGradientArray(colors, values):
+    """
+    Vectorized linearGradient: maps an array of values in [0, 1] to RGB.
+
+    Returns:
+      A uint8 array of shape values.shape + (3,).
+    """
+    colors = np.asarray(colors, dtype=float)[:, :3]
+    scaled = (len(colors) - 1) * np.clip(values, 0, 1 - 1e-3)
+    index = np.minimum(scaled.astype(int), len(colors) - 1)
+    percent = (scaled % 1)[..., None]
+    return (colors[index] + percent * (colors[np.minimum(index + 1, len(colors) - 1)] - colors[index])).astype(np.uint8)
+
+
+def brightnessArray(colors, shift):
+    # Vectorized brightness over an (..., 3) array
+    return np.minimum((np.asarray(colors, dtype=float) * shift).astype(int) + 1, 255).astype(np.uint8)
+
+
+def shiftHueArray(colors, hue_shift):
+    # Vectorized shift_hue over an (..., 3) array; same HSV round trip as colorsys
+    rgb = np.asarray(colors, dtype=float)[..., :3] / 255.0
+    r, g, b = rgb[..., 0], rgb[..., 1], rgb[..., 2]
+    maxc = rgb.max(axis=-1)
+    minc = rgb.min(axis=-1)
+    rangec = maxc - minc
+    grey = rangec == 0
+    safe_range = np.where(grey, 1, rangec)
+
+    rc = (maxc - r) / safe_range
+    gc = (maxc - g) / safe_range
+    bc = (maxc - b) / safe_range
+    h = np.where(r == maxc, bc - gc, np.where(g == maxc, 2.0 + rc - bc, 4.0 + gc - rc))
+    h = np.where(grey, 0.0, (h / 6.0) % 1.0)
+    s = np.where(grey, 0.0, rangec / np.where(maxc == 0, 1, maxc))
+    v = maxc
+
+    h = (h + hue_shift) % 1
+    i = (h * 6.0).astype(int)
+    f = h * 6.0 - i
+    i = i % 6
+    p = v * (1.0 - s)
+    q = v * (1.0 - s * f)
+    t = v * (1.0 - s * (1.0 - f))
+
+    out_r = np.choose(i, [v, q, p, p, t, v])
+    out_g = np.choose(i, [t, v, v, q, p, p])
+    out_b = np.choose(i, [p, p, t, v, v, q])
+    return (np.stack([out_r, out_g, out_b], axis=-1) * 255).astype(np.uint8)
+
+
 def setOpacity(color, newOpacity):
     return color[0], color[1], color[2], newOpacity
 
@@ -244,6 +315,52 @@ def draw_arrow(screen, start, end, color, pygameModel, thickness=3, arrowhead_le
     pygameModel.draw.line(screen, color, end, arrowhead_point2, thickness)
 
 
+def simplifyPath(path):
+    # Drops interior points that lie on a straight run, keeping only the corners
+    if len(path) < 3:
+        return list(path)
+    corners = [path[0]]
+    for prev, cur, nxt in zip(path, path[1:], path[2:]):
+        if (cur[0] - prev[0], cur[1] - prev[1]) != (nxt[0] - cur[0], nxt[1] - cur[1]):
+            corners.append(cur)
+    corners.append(path[-1])
+    return corners
+
+
+def createPathStrokeSurface(pygame, path, tileSize, color, width, size=None):
+    """
+    Renders a whole grid path as one stroke on its own surface.
+
+    Each straight run of simplifyPath(path) is filled as a single rect spanning
+    its cells, so with width == tileSize the stroke covers exactly the path's
+    tile rects; a narrower width is centred inside them.
+
+    Parameters:
+      pygame: base library
+      path: List of (x, y) grid cells, e.g. solutions[t]['path'].
+      tileSize: Pixel size of one grid cell.
+      color: Stroke color.
+      width: Stroke width in pixels (at most tileSize).
+      size: Surface size; defaults to just enclose the path.
+
+    Returns:
+      A pygame.Surface (SRCALPHA) to build once per solve and blit every frame.
+    """
+    if size is None:
+        size = ((max((p[0] for p in path), default=0) + 1) * tileSize, (max((p[1] for p in path), default=0) + 1) * tileSize)
+    surface = pygame.Surface(size, pygame.SRCALPHA)
+
+    width = min(width, tileSize)
+    inset = (tileSize - width) // 2
+    corners = simplifyPath(path)
+    runs = list(zip(corners, corners[1:])) or [(corner, corner) for corner in corners]
+    for (x1, y1), (x2, y2) in runs:
+        left, top = min(x1, x2) * tileSize + inset, min(y1, y2) * tileSize + inset
+        right, bottom = (max(x1, x2) + 1) * tileSize - inset, (max(y1, y2) + 1) * tileSize - inset
+        surface.fill(color, pygame.Rect(left, top, right - left, bottom - top))
+    return surface
+
+
 def search(direc, node, max_sizes, all_blocks):
     new_nodes = []
     searches = [[True, True], [True, True]]
@@ -267,18 +384,116 @@ def search(direc, node, max_sizes, all_blocks):
     return new_nodes
 
 
+def openNeighbors(node, max_sizes, all_blocks):
+    x, y = node
+    if x > 0 and all_blocks[x - 1][y] == 0:
+        yield x - 1, y
+    if x + 1 < max_sizes[0] and all_blocks[x + 1][y] == 0:
+        yield x + 1, y
+    if y > 0 and all_blocks[x][y - 1] == 0:
+        yield x, y - 1
+    if y + 1 < max_sizes[1] and all_blocks[x][y + 1] == 0:
+        yield x, y + 1
+
+
 def floodFillStep(queue, max_sizes, all_blocks):
-    for node in reversed(queue[0]):
-        for direc in range(4):
-            s = search(direc, node, max_sizes, all_blocks)
-            for new_node in s:
-                if (new_node not in queue[0]) and (new_node not in queue[1]):
-                    queue[0].append(new_node)
+    # queue = [frontier, filled]; expands the whole frontier by one layer.
+    # The visited bitmap is built on the first call and kept as queue[2]
+    if len(queue) < 3:
+        visited = np.zeros(max_sizes, dtype=bool)
+        for x, y in queue[1]:
+            visited[x, y] = True
+        queue.append(visited)
+    visited = queue[2]
+    for x, y in queue[0]:
+        visited[x, y] = True
+
+    new_frontier = []
+    for node in queue[0]:
+        for new_node in openNeighbors(node, max_sizes, all_blocks):
+            if not visited[new_node]:
+                visited[new_node] = True
+                new_frontier.append(list(new_node))
         queue[1].append(node)
-        queue[0].remove(node)
+    queue[0][:] = new_frontier
     return queue
 
 
+def createFloodFill(starts, max_sizes):
+    """
+    Creates a step-wise flood fill state backed by a visited bitmap.
+
+    Parameters:
+      starts: Iterable of (x, y) seed nodes.
+      max_sizes: (width, height) of all_blocks.
+
+    Returns:
+      A dict with 'frontier' (deque), 'visited' (bool array) and 'filled' (list of nodes).
+    """
+    visited = np.zeros(max_sizes, dtype=bool)
+    frontier = deque()
+    for x, y in starts:
+        if not visited[x, y]:
+            visited[x, y] = True
+            frontier.append((x, y))
+    return {'frontier': frontier, 'visited': visited, 'filled': [], 'max_sizes': max_sizes}
+
+
+def floodFillLayer(state, all_blocks):
+    """
+    Advances a createFloodFill state by one layer (one animation frame).
+    Returns the nodes reached in this layer; an empty list means the fill is done.
+    """
+    frontier, visited, filled = state['frontier'], state['visited'], state['filled']
+    reached = []
+    for _ in range(len(frontier)):
+        node = frontier.popleft()
+        filled.append(node)
+        for new_node in openNeighbors(node, state['max_sizes'], all_blocks):
+            if not visited[new_node]:
+                visited[new_node] = True
+                frontier.append(new_node)
+                reached.append(new_node)
+    return reached
+
+
+def connectedComponents(all_blocks):
+    """
+    Labels 4-connected regions of open (== 0) cells in one vectorized pass.
+
+    Returns:
+      (labels, count): labels has the shape of all_blocks, with -1 on blocked
+      cells and 0..count-1 on open ones.
+    """
+    open_mask = np.asarray(all_blocks) == 0
+    size = open_mask.size
+    if size == 0:
+        return np.full(open_mask.shape, -1), 0
+
+    # Every open cell starts labelled with its own flat index; blocked cells hold `size`
+    labels = np.where(open_mask, np.arange(size).reshape(open_mask.shape), size)
+    while True:
+        merged = labels.copy()
+        np.minimum(merged[1:], labels[:-1], out=merged[1:])
+        np.minimum(merged[:-1], labels[1:], out=merged[:-1])
+        np.minimum(merged[:, 1:], labels[:, :-1], out=merged[:, 1:])
+        np.minimum(merged[:, :-1], labels[:, 1:], out=merged[:, :-1])
+        merged[~open_mask] = size
+
+        # Pointer jumping: follow each label to the label of the cell it names
+        flat = merged.ravel()
+        open_flat = flat < size
+        flat[open_flat] = flat[flat[open_flat]]
+
+        if np.array_equal(merged, labels):
+            break
+        labels = merged
+
+    output = np.full(open_mask.shape, -1)
+    roots, output[open_mask] = np.unique(labels[open_mask], return_inverse=True)
+    return output, len(roots)
+
+
 def rectRotation(center, w, h, a=0):
     # tr tl bl br
     cords = [[center[0] + ((w / 2) * math.cos(a)) - ((h / 2) * math.sin(a)), center[1] + ((w / 2) * math.sin(a)) + ((h / 2) * math.cos(a))], [center[0] - ((w / 2) * math.cos(a)) - ((h / 2) * math.sin(a)), center[1] - ((w / 2) * math.sin(a)) + ((h / 2) * math.cos(a))], [center[0] - ((w / 2) * math.cos(a)) + ((h / 2) * math.sin(a)), center[1] - ((w / 2) * math.sin(a)) - ((h / 2) * math.cos(a))],
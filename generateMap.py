@@ -1,6 +1,9 @@
 import random
 import heapq
 import collections
+import time
+import numpy as np
+import calcs
 
 
 class IARCMapGenerator:
@@ -26,6 +29,10 @@ class IARCMapGenerator:
         self.OUT_DANGER_HIDDEN = 7
         self.OUT_MISSED_ZONE = 8
 
+        # Solver Limits
+        self.MAX_PATH_WIDTH = 8
+        self.MAX_TOLERANCE = 2
+
         # State
         self.grid = []
         self.mines_visible = []
@@ -38,6 +45,29 @@ class IARCMapGenerator:
         # Store best results for each tolerance level (0, 1, 2)
         self.solutions = {}
 
+        # Non-dominated (width, length, sacrificed, path) tuples from the pareto solver
+        self.pareto_front = []
+
+        # width -> lower bound on sacrifices needed (compute_min_sacrifices), filled while solving
+        self.min_sacrifices = {}
+
+        # Optional SolutionCache consulted by solve_all_scenarios
+        self.solution_cache = None
+
+        # Optional HierarchicalPlanner used for tolerance-0 sweep searches, with flat A* as fallback
+        self.hierarchical_planner = None
+
+        # Set when the last search or solve stopped on its expansion/time budget
+        self.last_search_exhausted = False
+        self.budget_exhausted = False
+
+        # Per-cell expansion counts (HEIGHT x WIDTH) of the last solve, when record_expansions is set
+        self.record_expansions = False
+        self.expansion_counts = None
+
+        # Bumped by every generate_base_map so derived caches can tell the map changed
+        self.map_version = 0
+
         self.start_node = (0, self.HEIGHT // 2)
         self.end_node = (self.WIDTH - 1, self.HEIGHT // 2)
 
@@ -45,10 +75,20 @@ class IARCMapGenerator:
         self.generate_base_map(safe_buffer_size=2)
 
     def generate_base_map(self, num_trees=12, num_mines=135, hidden_rate=0.05, safe_buffer_size=2):
-        self.grid = [[self.TILE_EMPTY for _ in range(self.WIDTH)] for _ in range(self.HEIGHT)]
+        self.map_version += 1
+
+        # Reuse the existing rows when the field size is unchanged (batch runs regenerate constantly)
+        if len(self.grid) == self.HEIGHT and all(len(row) == self.WIDTH for row in self.grid):
+            blank_row = [self.TILE_EMPTY] * self.WIDTH
+            for row in self.grid:
+                row[:] = blank_row
+        else:
+            self.grid = [[self.TILE_EMPTY for _ in range(self.WIDTH)] for _ in range(self.HEIGHT)]
         self.mines_visible = []
         self.mines_hidden = []
         self.solutions = {}
+        self.pareto_front = []
+        self.min_sacrifices = {}
 
         # 1. Obstacles
         for _ in range(num_trees):
@@ -127,7 +167,147 @@ class IARCMapGenerator:
         # Assuming A=0 and N=0 for simplicity in this optimization
         return (150000 * w_feet) / ((1 + missed_count) * l_feet)
 
-    def run_weighted_astar(self, width, allowed_missed_count):
+    def compute_max_clear_width(self):
+        """
+        Widest-path (bottleneck) Dijkstra over distance_field_visible.
+        Returns the largest width whose corridor connects start_node to
+        end_node without touching any visible-mine zone, or -1 if none does.
+        """
+        start, end = self.start_node, self.end_node
+
+        def clearance(node):
+            tile = self.grid[node[1]][node[0]]
+            if tile == self.TILE_OBSTACLE or tile == self.TILE_MINE_VISIBLE:
+                return -1
+            return self.distance_field_visible.get(node, 999)
+
+        best = {start: clearance(start)}
+        frontier = [(-best[start], start[0], start[1])]
+
+        while frontier:
+            neg_b, cx, cy = heapq.heappop(frontier)
+            b = -neg_b
+            if (cx, cy) == end:
+                # A cell at distance d is clear for any width below d
+                return b - 1
+            if b < best.get((cx, cy), -1): continue
+
+            for nx, ny in [(cx + 1, cy), (cx - 1, cy), (cx, cy + 1), (cx, cy - 1)]:
+                if 0 <= nx < self.WIDTH and 0 <= ny < self.HEIGHT:
+                    nb = min(b, clearance((nx, ny)))
+                    if nb > best.get((nx, ny), -1):
+                        best[(nx, ny)] = nb
+                        heapq.heappush(frontier, (-nb, nx, ny))
+
+        return -1
+
+    def search_budget_spent(self, expansions, max_expansions, deadline):
+        if max_expansions is not None and expansions >= max_expansions:
+            return True
+        return deadline is not None and time.perf_counter() >= deadline
+
+    def field_array(self, field, default=999):
+        """
+        Copies a {(x, y): value} field into a (HEIGHT, WIDTH) array.
+        """
+        arr = np.full((self.HEIGHT, self.WIDTH), default, dtype=np.int32)
+        if field:
+            keys = np.array(list(field.keys()), dtype=np.int32)
+            arr[keys[:, 1], keys[:, 0]] = np.fromiter(field.values(), dtype=np.int32, count=len(field))
+        return arr
+
+    def compute_min_sacrifices(self, width, arrays=None):
+        """
+        Lower bound on the distinct visible-mine zones any path must sacrifice at
+        this width (inf if start and end are sealed off from each other).
+
+        Clear cells are grouped into connected components and each mine's zone is
+        contracted to one node; a 0-1 BFS over that graph then charges 1 per
+        zone entered. Contracting zones only adds connectivity, so the result
+        never exceeds the true requirement and can prove a search infeasible.
+        arrays=(free, dist, ids) reuses arrays across widths.
+        """
+        if arrays is None:
+            arrays = self.solver_arrays()
+        free, dist, ids = arrays
+
+        clear = free & (dist > width)
+        zone = free & ~clear & (ids >= 0)
+        labels, count = calcs.connectedComponents(np.where(clear, 0, 1))
+
+        # Node per cell: clear component, count + mine id for zone cells, -1 if blocked
+        nodes = np.where(clear, labels, np.where(zone, count + ids, -1))
+
+        adjacency = collections.defaultdict(set)
+        for a, b in ((nodes[:, :-1], nodes[:, 1:]), (nodes[:-1, :], nodes[1:, :])):
+            mask = (a >= 0) & (b >= 0) & (a != b)
+            for u, v in np.unique(np.stack([a[mask], b[mask]], axis=1), axis=0):
+                adjacency[int(u)].add(int(v))
+                adjacency[int(v)].add(int(u))
+
+        start = int(nodes[self.start_node[1], self.start_node[0]])
+        end = int(nodes[self.end_node[1], self.end_node[0]])
+        if start < 0 or end < 0:
+            return float('inf')
+
+        best = {start: 1 if start >= count else 0}
+        queue = collections.deque([start])
+        while queue:
+            node = queue.popleft()
+            if node == end:
+                return best[node]
+            for nxt in adjacency[node]:
+                step = 1 if nxt >= count else 0
+                if best[node] + step < best.get(nxt, float('inf')):
+                    best[nxt] = best[node] + step
+                    if step: queue.append(nxt)
+                    else: queue.appendleft(nxt)
+
+        return float('inf')
+
+    def solver_arrays(self):
+        grid = np.array(self.grid, dtype=np.int8)
+        free = (grid != self.TILE_OBSTACLE) & (grid != self.TILE_MINE_VISIBLE)
+        return free, self.field_array(self.distance_field_visible), self.field_array(self.mine_id_map, -1)
+
+    def min_sacrifices_at(self, width, arrays=None):
+        # The bound only grows with width, so an infinite one carries over to wider corridors
+        if width not in self.min_sacrifices:
+            if self.min_sacrifices.get(width - 1) == float('inf'):
+                self.min_sacrifices[width] = float('inf')
+            else:
+                self.min_sacrifices[width] = self.compute_min_sacrifices(width, arrays)
+        return self.min_sacrifices[width]
+
+    def record_unsolved_reasons(self):
+        """
+        Fills 'reason' for every tolerance in self.solutions that found no path.
+        """
+        unsolved = [t for t, sol in self.solutions.items() if not sol['found']]
+        if not unsolved: return
+
+        needed = self.min_sacrifices_at(0)
+        for t in unsolved:
+            sol = self.solutions[t]
+            if needed == float('inf'):
+                sol['reason'] = "start and end are sealed off"
+            elif needed > t:
+                sol['reason'] = f"needs at least {needed} sacrificed mine zones even at width 0"
+            elif self.min_sacrifices_at(1) > t:
+                # Width 0 scores 0, so a width-0-only route is not a solution
+                sol['reason'] = f"only width 0 connects within tolerance {t}"
+            elif self.budget_exhausted:
+                sol['reason'] = "search budget exhausted"
+            else:
+                sol['reason'] = "no path found"
+
+    def run_weighted_astar(self, width, allowed_missed_count, max_expansions=None, deadline=None):
+        """
+        Shortest path at a fixed width with at most allowed_missed_count sacrificed
+        mine zones. Gives up with (None, set()) once max_expansions states have been
+        expanded or time.perf_counter() passes deadline.
+        """
+        self.last_search_exhausted = False
         start = self.start_node
         start_dist = self.distance_field_visible.get(start, 999)
 
@@ -147,9 +327,16 @@ class IARCMapGenerator:
 
         min_costs = {start_state: 0}
         came_from = {}
+        expansions = 0
 
         while frontier:
+            if self.search_budget_spent(expansions, max_expansions, deadline):
+                self.last_search_exhausted = True
+                break
+            expansions += 1
+
             _, current_g, cx, cy, c_violated = heapq.heappop(frontier)
+            if self.expansion_counts is not None: self.expansion_counts[cy, cx] += 1
 
             if (cx, cy) == self.end_node:
                 path = []
@@ -190,41 +377,470 @@ class IARCMapGenerator:
 
         return None, set()
 
-    def solve_all_scenarios(self):
+    def run_anytime_astar(self, width, allowed_missed_count, max_expansions=None, deadline=None,
+                          epsilon=3.0, epsilon_step=0.5):
+        """
+        ARA*-style anytime search. Starts with heuristic inflation epsilon, which
+        finds a path quickly, then lowers epsilon and reuses the search effort to
+        improve it until epsilon reaches 1 or the budget runs out.
+
+        Returns (path, sacrificed, bound): the best path found so far and a bound
+        on how far its length can be from optimal (1.0 means optimal).
+        Returns (None, set(), None) if no path was found in budget.
+        """
+        self.last_search_exhausted = False
+        start = self.start_node
+        start_dist = self.distance_field_visible.get(start, 999)
+
+        initial_violated = frozenset()
+        if start_dist <= width:
+            mid = self.mine_id_map.get(start, -1)
+            if mid != -1: initial_violated = frozenset([mid])
+
+        if len(initial_violated) > allowed_missed_count:
+            return None, set(), None
+
+        def h(state):
+            return self.heuristic((state[0], state[1]), self.end_node)
+
+        # State: (x, y, frozenset(violated_ids))
+        start_state = (start[0], start[1], initial_violated)
+        g = {start_state: 0}
+        came_from = {}
+
+        frontier = [(epsilon * h(start_state), 0, start_state)]
+        closed = set()
+        incons = set()
+
+        best_goal = None
+        best_g = float('inf')
+        expansions = 0
+        # Epsilon of the last round that ran to completion; its guarantee still holds
+        completed_epsilon = float('inf')
+
+        while True:
+            # Improve the current solution under this epsilon
+            while frontier:
+                key, state_g, state = frontier[0]
+                if state_g != g[state] or state in closed:
+                    heapq.heappop(frontier)  # Stale entry
+                    continue
+                if key >= best_g:
+                    break
+
+                if self.search_budget_spent(expansions, max_expansions, deadline):
+                    self.last_search_exhausted = True
+                    break
+                expansions += 1
+
+                heapq.heappop(frontier)
+                closed.add(state)
+                cx, cy, c_violated = state
+                if self.expansion_counts is not None: self.expansion_counts[cy, cx] += 1
+
+                if (cx, cy) == self.end_node:
+                    if state_g < best_g:
+                        best_goal, best_g = state, state_g
+                    continue
+
+                for nx, ny in [(cx + 1, cy), (cx - 1, cy), (cx, cy + 1), (cx, cy - 1)]:
+                    if 0 <= nx < self.WIDTH and 0 <= ny < self.HEIGHT:
+
+                        tile = self.grid[ny][nx]
+                        if tile == self.TILE_OBSTACLE or tile == self.TILE_MINE_VISIBLE:
+                            continue
+
+                        new_violated = c_violated
+                        if self.distance_field_visible.get((nx, ny), 999) <= width:
+                            m_id = self.mine_id_map.get((nx, ny), -1)
+                            if m_id != -1 and m_id not in c_violated:
+                                if len(c_violated) >= allowed_missed_count:
+                                    continue  # Wall
+                                new_violated = c_violated | {m_id}
+
+                        next_state = (nx, ny, new_violated)
+                        new_g = state_g + 1
+                        if new_g < g.get(next_state, float('inf')):
+                            g[next_state] = new_g
+                            came_from[next_state] = state
+                            if next_state in closed:
+                                incons.add(next_state)
+                            else:
+                                heapq.heappush(frontier, (new_g + epsilon * h(next_state), new_g, next_state))
+
+            if self.last_search_exhausted:
+                break
+            completed_epsilon = epsilon
+            if epsilon <= 1:
+                break
+
+            # Tighten epsilon and re-open everything that improved while closed
+            epsilon = max(1.0, epsilon - epsilon_step)
+            pending = {state for _, state_g, state in frontier if state_g == g[state] and state not in closed} | incons
+            frontier = [(g[state] + epsilon * h(state), g[state], state) for state in pending]
+            heapq.heapify(frontier)
+            closed = set()
+            incons = set()
+
+        if best_goal is None:
+            return None, set(), None
+
+        # Suboptimality bound: best cost over the smallest admissible estimate still open
+        open_states = {state for _, state_g, state in frontier if state_g == g[state]} | incons
+        bound = completed_epsilon
+        if open_states:
+            lower = min(g[state] + h(state) for state in open_states)
+            if lower > 0:
+                bound = max(1.0, min(completed_epsilon, best_g / lower))
+
+        path = []
+        curr = best_goal
+        while curr in came_from:
+            path.append((curr[0], curr[1]))
+            curr = came_from[curr]
+        path.append(start)
+        return path[::-1], set(best_goal[2]), bound
+
+    def run_pareto_search(self, width, allowed_missed_count, max_expansions=None, deadline=None):
+        """
+        Labeled multi-criteria search at a fixed width.
+        Returns every non-dominated (length, sacrificed, path) that reaches
+        end_node with at most allowed_missed_count sacrificed mines, or the
+        ones reached so far once max_expansions labels have been expanded or
+        time.perf_counter() passes deadline.
+        """
+        self.last_search_exhausted = False
+        start = self.start_node
+        start_dist = self.distance_field_visible.get(start, 999)
+
+        initial_violated = frozenset()
+        if start_dist <= width:
+            mid = self.mine_id_map.get(start, -1)
+            if mid != -1: initial_violated = frozenset([mid])
+
+        if len(initial_violated) > allowed_missed_count:
+            return []
+
+        # Label: (x, y, length_so_far, violated, parent_label_index)
+        labels = [(start[0], start[1], 1, initial_violated, -1)]
+        # (x, y) -> [(g, violated)] of the non-dominated labels at that cell
+        cell_labels = {start: [(1, initial_violated)]}
+
+        frontier = [(1 + self.heuristic(start, self.end_node), 1, 0)]
+        goals = []
+        expansions = 0
+
+        while frontier:
+            if self.search_budget_spent(expansions, max_expansions, deadline):
+                self.last_search_exhausted = True
+                break
+            expansions += 1
+
+            _, g, idx = heapq.heappop(frontier)
+            cx, cy, _, c_violated, _ = labels[idx]
+
+            # Skip labels that were dominated after being queued
+            if (g, c_violated) not in cell_labels[(cx, cy)]:
+                continue
+
+            # Skip labels that cannot end shorter or with fewer sacrifices than a goal already reached
+            lower_len = g + abs(cx - self.end_node[0]) + abs(cy - self.end_node[1])
+            if any(gl <= lower_len and len(gv) <= len(c_violated) for gl, gv, _ in goals):
+                continue
+            if self.expansion_counts is not None: self.expansion_counts[cy, cx] += 1
+
+            if (cx, cy) == self.end_node:
+                path = []
+                while idx != -1:
+                    px, py, _, _, idx = labels[idx]
+                    path.append((px, py))
+                goals.append((g, c_violated, tuple(path[::-1])))
+                continue
+
+            for nx, ny in [(cx + 1, cy), (cx - 1, cy), (cx, cy + 1), (cx, cy - 1)]:
+                if 0 <= nx < self.WIDTH and 0 <= ny < self.HEIGHT:
+
+                    tile = self.grid[ny][nx]
+                    if tile == self.TILE_OBSTACLE or tile == self.TILE_MINE_VISIBLE:
+                        continue
+
+                    new_violated = c_violated
+                    if self.distance_field_visible.get((nx, ny), 999) <= width:
+                        m_id = self.mine_id_map.get((nx, ny), -1)
+                        if m_id != -1 and m_id not in c_violated:
+                            if len(c_violated) >= allowed_missed_count:
+                                continue  # Wall
+                            new_violated = c_violated | {m_id}
+
+                    # A label is dominated by one that is no longer and sacrificed a subset
+                    new_g = g + 1
+                    existing = cell_labels.setdefault((nx, ny), [])
+                    if any(og <= new_g and ov <= new_violated for og, ov in existing):
+                        continue
+                    existing[:] = [(og, ov) for og, ov in existing if not (new_g <= og and new_violated <= ov)]
+                    existing.append((new_g, new_violated))
+
+                    labels.append((nx, ny, new_g, new_violated, idx))
+                    priority = new_g + self.heuristic((nx, ny), self.end_node)
+                    heapq.heappush(frontier, (priority, new_g, len(labels) - 1))
+
+        return [(gl, gv, gp) for gl, gv, gp in goals
+                if not any(ol <= gl and len(ov) <= len(gv) and (ol, len(ov)) != (gl, len(gv)) for ol, ov, _ in goals)]
+
+    def solve_pareto_front(self, widths=None, max_tolerance=None, max_expansions=None, deadline=None):
+        """
+        Computes the Pareto front of (width, path length, sacrificed count) and
+        stores it in self.pareto_front as (width, length, sacrificed, path) tuples,
+        widest first. Any scoring formula can then be applied with solutions_from_front.
+        max_expansions caps the search at each width; once it or deadline runs
+        out the front only covers what was found so far.
+        """
+        if widths is None: widths = range(0, self.MAX_PATH_WIDTH + 1)
+        if max_tolerance is None: max_tolerance = self.MAX_TOLERANCE
+
+        arrays = self.solver_arrays()
+        points = []
+        for width in widths:
+            # Proven infeasible here, and wider corridors only need more sacrifices
+            if self.min_sacrifices_at(width, arrays) > max_tolerance: break
+
+            found = self.run_pareto_search(width, max_tolerance, max_expansions, deadline)
+            for length, sacrificed, path in found:
+                points.append((width, length, sacrificed, path))
+
+            if self.last_search_exhausted:
+                self.budget_exhausted = True
+                break
+            # Wider corridors only remove cells, so nothing beyond this width connects either
+            if not found: break
+
+        front = []
+        for p in points:
+            if not any(q[0] >= p[0] and q[1] <= p[1] and len(q[2]) <= len(p[2])
+                       and (q[0], q[1], len(q[2])) != (p[0], p[1], len(p[2])) for q in points):
+                front.append(p)
+        front.sort(key=lambda p: (-p[0], p[1], len(p[2])))
+
+        self.pareto_front = front
+        return front
+
+    def solutions_from_front(self, tolerances=None, score_fn=None):
+        """
+        Picks the best front entry for each tolerance with score_fn(length, width, missed),
+        defaulting to calculate_score. Fills and returns self.solutions.
+        Tolerance t means "at most t sacrificed" across the whole front.
+        """
+        if tolerances is None: tolerances = range(self.MAX_TOLERANCE + 1)
+        if score_fn is None: score_fn = self.calculate_score
+
+        self.solutions = {}
+        for t in tolerances:
+            self.solutions[t] = {
+                'score': 0, 'found': False,
+                'path': [], 'width': 0, 'sacrificed': set(), 'reason': None
+            }
+
+        for width, length, sacrificed, path in self.pareto_front:
+            score = score_fn(length, width, len(sacrificed))
+            for t in tolerances:
+                if len(sacrificed) <= t and score > self.solutions[t]['score']:
+                    self.solutions[t] = {
+                        'score': score,
+                        'found': True,
+                        'path': list(path),
+                        'width': width,
+                        'sacrificed': set(sacrificed),
+                        'reason': None
+                    }
+
+        self.record_unsolved_reasons()
+        return self.solutions
+
+    def solve_all_scenarios(self, mode="sweep", time_budget=None, max_expansions=None, anytime=False):
         """
         Runs the optimizer for Tolerance 0, 1, and 2 independently.
-        Stores the best result for each in self.solutions.
+        Stores the best result for each in self.solutions and returns it.
+        mode="pareto" solves the full Pareto front once and scores it instead.
+
+        The two modes read tolerance differently. The sweep keeps the best path
+        its own searches found when each was allowed t sacrifices. Pareto takes
+        the best front entry with at most t sacrifices, so a tolerance can reuse a
+        path that sacrifices fewer mines. Without a budget cutoff, pareto scores
+        never fall as t grows and never fall below the sweep's, so the chosen
+        width can differ (seed 0, tolerance 1: sweep 1264 at width 3, pareto
+        1744 at width 2).
+
+        time_budget (seconds) caps the whole solve and max_expansions caps each
+        search. The time is shared equally among the searches still able to run.
+        When either runs out the best paths found so far are kept, a tolerance
+        whose own searches were cut short falls back to a lower tolerance's path,
+        and self.budget_exhausted is set. anytime=True runs every search with
+        run_anytime_astar so it can still return a path when cut short; pareto
+        mode already keeps every path reached before a cutoff, so it does not
+        take anytime.
+
+        With self.hierarchical_planner set, the sweep's tolerance-0 searches use
+        its plan() first and only fall back to flat A* when it returns None. Its
+        paths can be slightly longer than flat A*'s in exchange for far fewer
+        expanded cells on large fields.
         """
+        if anytime and mode == "pareto":
+            raise ValueError("anytime=True only applies to mode='sweep'")
+
+        widths = range(0, self.MAX_PATH_WIDTH + 1)
+        tolerances = range(self.MAX_TOLERANCE + 1)
+
+        self.budget_exhausted = False
+        deadline = None if time_budget is None else time.perf_counter() + time_budget
+        self.expansion_counts = np.zeros((self.HEIGHT, self.WIDTH), dtype=np.int32) if self.record_expansions else None
+
+        # Identical maps (same grid, endpoints and ranges) reuse a cached result
+        cache_key = None
+        if self.solution_cache is not None:
+            # Hierarchical paths can be longer than flat ones, so they are cached separately
+            key_mode = mode if self.hierarchical_planner is None or mode == "pareto" else mode + "-hierarchical"
+            cache_key = self.solution_cache.make_key(self, widths, tolerances, key_mode)
+            cached = self.solution_cache.get(cache_key)
+            # An entry solved without recording has no expansion counts to show, so re-solve
+            if cached is not None and self.record_expansions and cached['expansion_counts'] is None:
+                cached = None
+            if cached is not None:
+                if self.record_expansions:
+                    self.expansion_counts = cached['expansion_counts']
+                self.min_sacrifices = dict(cached['min_sacrifices'])
+                if mode == "pareto":
+                    self.pareto_front = cached['result']
+                    return self.solutions_from_front(tolerances)
+                self.solutions = cached['result']
+                return self.solutions
+
+        if mode == "pareto":
+            self.solve_pareto_front(widths, tolerances[-1], max_expansions, deadline)
+            if cache_key is not None and not self.budget_exhausted:
+                self.solution_cache.put(cache_key, self.cache_entry(self.pareto_front))
+            return self.solutions_from_front(tolerances)
+
         # Reset solutions container
         self.solutions = {}
-        for t in range(3):
+        for t in tolerances:
             self.solutions[t] = {
                 'score': 0, 'found': False,
-                'path': [], 'width': 0, 'sacrificed': set()
+                'path': [], 'width': 0, 'sacrificed': set(), 'reason': None
             }
 
+        # Tolerance 0 is a bottleneck problem: no width above the widest clear
+        # corridor can connect, so only widths from there down are searched, and
+        # only while their best possible score (shortest conceivable path) can
+        # still beat the result already found
+        max_clear = min(self.compute_max_clear_width(), widths[-1])
+
+        # Width 0 always scores 0, so it can never be recorded and is not searched.
+        # Bounds only grow with width, so widths stop at the first one that needs
+        # more sacrifices than the largest tolerance; nothing wider is feasible either
+        arrays = self.solver_arrays()
+        scored_widths = []
+        for width in widths:
+            if width == 0: continue
+            if self.min_sacrifices_at(width, arrays) > tolerances[-1]: break
+            scored_widths.append(width)
+
+        # Every (width, tolerance) search still to run in the optimization loop
+        sacrifice_runs = [(w, t) for w in scored_widths for t in tolerances if t > 0 and self.min_sacrifices[w] <= t]
+
+        if 0 in tolerances:
+            min_len = abs(self.start_node[0] - self.end_node[0]) + abs(self.start_node[1] - self.end_node[1]) + 1
+
+            def can_improve(w):
+                return self.calculate_score(min_len, w, 0) >= self.solutions[0]['score']
+
+            for width in range(max_clear, max(widths[0], 1) - 1, -1):
+                if not can_improve(width):
+                    break
+                # Only the widths that could still beat the best result so far are counted
+                runs_left = sum(1 for w in range(width, 0, -1) if can_improve(w)) + len(sacrifice_runs)
+                path, sacrificed = self.run_budgeted_search(width, 0, runs_left, deadline, max_expansions, anytime)
+                # Ties go to the narrower width, as in the ascending sweep
+                self.record_if_better(0, width, path, sacrificed, replace_ties=True)
+
         # Optimization Loop
-        # Check Widths 0 to 8
-        for width in range(0, 9):
-            # Check Tolerances 0 to 2
-            for tolerance in range(3):
-
-                path, sacrificed = self.run_weighted_astar(width, tolerance)
-
-                if path:
-                    missed = len(sacrificed)
-                    length = len(path)
-                    score = self.calculate_score(length, width, missed)
-
-                    # Update if this is the best score for THIS tolerance level
-                    if score > self.solutions[tolerance]['score']:
-                        self.solutions[tolerance] = {
-                            'score': score,
-                            'found': True,
-                            'path': path,
-                            'width': width,
-                            'sacrificed': sacrificed
-                        }
+        # Check Widths 1 to MAX_PATH_WIDTH and Tolerances 1 to MAX_TOLERANCE
+        for i, (width, tolerance) in enumerate(sacrifice_runs):
+            runs_left = len(sacrifice_runs) - i
+            path, sacrificed = self.run_budgeted_search(width, tolerance, runs_left, deadline, max_expansions, anytime)
+            self.record_if_better(tolerance, width, path, sacrificed)
+
+        # A search cut short leaves its tolerance empty; a path kept at a lower
+        # tolerance sacrifices fewer mines, so it is still the best feasible one found
+        if self.budget_exhausted:
+            for t in tolerances:
+                if self.solutions[t]['found']: continue
+                lower = [self.solutions[lt] for lt in tolerances if lt < t and self.solutions[lt]['found']]
+                if lower:
+                    best = max(lower, key=lambda sol: sol['score'])
+                    self.solutions[t] = dict(best, path=list(best['path']), sacrificed=set(best['sacrificed']))
+
+        self.record_unsolved_reasons()
+
+        # Budget-limited results are not final, so they are never cached
+        if cache_key is not None and not self.budget_exhausted:
+            self.solution_cache.put(cache_key, self.cache_entry(self.solutions))
+        return self.solutions
+
+    def cache_entry(self, result):
+        # Expansion counts and sacrifice bounds travel with the result so cache
+        # hits can still show the heatmap and explain unsolved tolerances
+        return {'result': result, 'expansion_counts': self.expansion_counts, 'min_sacrifices': dict(self.min_sacrifices)}
+
+    def run_budgeted_search(self, width, tolerance, runs_left, deadline, max_expansions, anytime):
+        # Each remaining run gets an equal share of the time left; unused time rolls over
+        if deadline is not None:
+            now = time.perf_counter()
+            deadline = now + max(0.0, deadline - now) / max(1, runs_left)
+
+        # Coarse-to-fine planning for clear corridors; flat A* still runs when it finds nothing
+        if tolerance == 0 and self.hierarchical_planner is not None:
+            path = self.hierarchical_planner.plan(width)
+            if path:
+                self.last_search_exhausted = False
+                return path, set()
+
+        if anytime:
+            path, sacrificed, _ = self.run_anytime_astar(width, tolerance, max_expansions, deadline)
+        else:
+            path, sacrificed = self.run_weighted_astar(width, tolerance, max_expansions, deadline)
+
+        if self.last_search_exhausted:
+            self.budget_exhausted = True
+        return path, sacrificed
+
+    def record_if_better(self, tolerance, width, path, sacrificed, replace_ties=False):
+        if not path: return
+
+        missed = len(sacrificed)
+        length = len(path)
+        score = self.calculate_score(length, width, missed)
+
+        # Update if this is the best score for THIS tolerance level
+        best = self.solutions[tolerance]['score']
+        if score > best or (replace_ties and score == best and score > 0):
+            self.solutions[tolerance] = {
+                'score': score,
+                'found': True,
+                'path': path,
+                'width': width,
+                'sacrificed': sacrificed,
+                'reason': None
+            }
+
+    def count_path_violations(self, path, width):
+        """
+        Number of path cells within `width` of any mine, hidden ones included.
+        """
+        violations = 0
+        for (px, py) in path:
+            if self.distance_field_all.get((px, py), 999) <= width:
+                violations += 1
+        return violations
 
     def get_render_data_for_tolerance(self, tolerance_index):
         """
@@ -270,11 +886,8 @@ class IARCMapGenerator:
                             display_grid[y][x] = self.OUT_UNSURE
 
         # 2. Path & Stats
-        violations = 0
-        if path:
-            for (px, py) in path:
-                display_grid[py][px] = self.OUT_SAFE_PATH
-                if self.distance_field_all.get((px, py), 999) <= width:
-                    violations += 1
+        for (px, py) in path:
+            display_grid[py][px] = self.OUT_SAFE_PATH
+        violations = self.count_path_violations(path, width)
 
         return display_grid, violations, score, width, True
\ No newline at end of file
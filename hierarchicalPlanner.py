@@ -0,0 +1,242 @@
+import time
+import heapq
+import collections
+
+
+class HierarchicalPlanner:
+    """
+    HPA*-style coarse-to-fine planner over an IARCMapGenerator map.
+
+    The field is split into cluster_size x cluster_size clusters. Abstract nodes
+    sit on both sides of every entrance between neighbouring clusters, and
+    intra-cluster edges hold the BFS distance between nodes of the same cluster.
+    A path is planned on that graph first, then refined with cell-level A*
+    restricted to the clusters it passes through.
+
+    Only tolerance 0 is planned: any cell within `width` of a visible mine is a
+    wall. Abstract graphs are built once per width and map; they are rebuilt
+    automatically when map_gen.map_version changes.
+
+    Assign an instance to map_gen.hierarchical_planner to have the sweep in
+    solve_all_scenarios use it for its tolerance-0 searches.
+    """
+
+    def __init__(self, map_gen, cluster_size=10):
+        self.map_gen = map_gen
+        self.cluster_size = cluster_size
+
+        # width -> (map_version, {node: [(neighbor, cost)]})
+        self.graphs = {}
+        # Cells expanded by the last refinement, for comparison with the flat solver
+        self.last_expansions = 0
+
+    def reset(self):
+        self.graphs = {}
+
+    def passable(self, x, y, width):
+        gen = self.map_gen
+        tile = gen.grid[y][x]
+        if tile == gen.TILE_OBSTACLE or tile == gen.TILE_MINE_VISIBLE:
+            return False
+        return gen.distance_field_visible.get((x, y), 999) > width
+
+    def cluster_of(self, x, y):
+        return x // self.cluster_size, y // self.cluster_size
+
+    def cluster_bounds(self, cluster):
+        cs = self.cluster_size
+        x0, y0 = cluster[0] * cs, cluster[1] * cs
+        return x0, y0, min(x0 + cs, self.map_gen.WIDTH), min(y0 + cs, self.map_gen.HEIGHT)
+
+    def get_graph(self, width):
+        cached = self.graphs.get(width)
+        if cached is None or cached[0] != self.map_gen.map_version:
+            cached = (self.map_gen.map_version, self.build_abstract_graph(width))
+            self.graphs[width] = cached
+        return cached[1]
+
+    def build_abstract_graph(self, width):
+        gen = self.map_gen
+        cs = self.cluster_size
+        graph = collections.defaultdict(list)
+
+        def add_transitions(run):
+            # One transition in the middle of each entrance, two at the ends of long ones
+            picks = [run[len(run) // 2]] if len(run) < 6 else [run[0], run[-1]]
+            for a, b in picks:
+                graph[a].append((b, 1))
+                graph[b].append((a, 1))
+
+        # 1. Entrances across vertical cluster borders
+        for bx in range(cs - 1, gen.WIDTH - 1, cs):
+            for cy0 in range(0, gen.HEIGHT, cs):
+                run = []
+                for y in range(cy0, min(cy0 + cs, gen.HEIGHT)):
+                    if self.passable(bx, y, width) and self.passable(bx + 1, y, width):
+                        run.append(((bx, y), (bx + 1, y)))
+                    elif run:
+                        add_transitions(run)
+                        run = []
+                if run: add_transitions(run)
+
+        # 2. Entrances across horizontal cluster borders
+        for by in range(cs - 1, gen.HEIGHT - 1, cs):
+            for cx0 in range(0, gen.WIDTH, cs):
+                run = []
+                for x in range(cx0, min(cx0 + cs, gen.WIDTH)):
+                    if self.passable(x, by, width) and self.passable(x, by + 1, width):
+                        run.append(((x, by), (x, by + 1)))
+                    elif run:
+                        add_transitions(run)
+                        run = []
+                if run: add_transitions(run)
+
+        # 3. Intra-cluster edges between the nodes of each cluster
+        by_cluster = collections.defaultdict(list)
+        for node in list(graph):
+            by_cluster[self.cluster_of(*node)].append(node)
+
+        for cluster, nodes in by_cluster.items():
+            for node in nodes:
+                dists = self.cluster_bfs(node, cluster, width)
+                for other in nodes:
+                    if other != node and other in dists:
+                        graph[node].append((other, dists[other]))
+
+        return dict(graph)
+
+    def cluster_bfs(self, source, cluster, width):
+        x0, y0, x1, y1 = self.cluster_bounds(cluster)
+        dists = {source: 0}
+        queue = collections.deque([source])
+
+        while queue:
+            cx, cy = queue.popleft()
+            for nx, ny in [(cx + 1, cy), (cx - 1, cy), (cx, cy + 1), (cx, cy - 1)]:
+                if x0 <= nx < x1 and y0 <= ny < y1 and (nx, ny) not in dists:
+                    if self.passable(nx, ny, width):
+                        dists[(nx, ny)] = dists[(cx, cy)] + 1
+                        queue.append((nx, ny))
+        return dists
+
+    def plan_abstract(self, width):
+        """
+        Returns the abstract node sequence from start_node to end_node, or None.
+        """
+        gen = self.map_gen
+        start, end = gen.start_node, gen.end_node
+        if not self.passable(*start, width) or not self.passable(*end, width):
+            return None
+
+        graph = self.get_graph(width)
+
+        # Connect start and end to their clusters without touching the cached graph
+        extra = collections.defaultdict(list)
+        for endpoint in (start, end):
+            cluster = self.cluster_of(*endpoint)
+            dists = self.cluster_bfs(endpoint, cluster, width)
+            for node in graph:
+                if node in dists and self.cluster_of(*node) == cluster:
+                    extra[endpoint].append((node, dists[node]))
+                    extra[node].append((endpoint, dists[node]))
+            if endpoint == start and end in dists:
+                extra[start].append((end, dists[end]))
+
+        def h(node):
+            return abs(node[0] - end[0]) + abs(node[1] - end[1])
+
+        best = {start: 0}
+        came_from = {}
+        frontier = [(h(start), 0, start)]
+
+        while frontier:
+            _, cost, node = heapq.heappop(frontier)
+            if node == end:
+                path = [node]
+                while node in came_from:
+                    node = came_from[node]
+                    path.append(node)
+                return path[::-1]
+            if cost > best[node]: continue
+
+            for nxt, step in graph.get(node, []) + extra.get(node, []):
+                new_cost = cost + step
+                if new_cost < best.get(nxt, float('inf')):
+                    best[nxt] = new_cost
+                    came_from[nxt] = node
+                    heapq.heappush(frontier, (new_cost + h(nxt), new_cost, nxt))
+
+        return None
+
+    def plan(self, width):
+        """
+        Coarse-to-fine plan at the given width. Returns a cell path or None.
+        """
+        abstract = self.plan_abstract(width)
+        self.last_expansions = 0
+        if abstract is None:
+            return None
+
+        corridor = {self.cluster_of(*node) for node in abstract}
+        return self.refine(width, corridor)
+
+    def refine(self, width, corridor):
+        gen = self.map_gen
+        start, end = gen.start_node, gen.end_node
+
+        best = {start: 0}
+        came_from = {}
+        frontier = [(gen.heuristic(start, end), 0, start)]
+
+        while frontier:
+            _, cost, node = heapq.heappop(frontier)
+            if cost > best[node]: continue
+            self.last_expansions += 1
+
+            if node == end:
+                path = [node]
+                while node in came_from:
+                    node = came_from[node]
+                    path.append(node)
+                return path[::-1]
+
+            cx, cy = node
+            for nx, ny in [(cx + 1, cy), (cx - 1, cy), (cx, cy + 1), (cx, cy - 1)]:
+                if 0 <= nx < gen.WIDTH and 0 <= ny < gen.HEIGHT:
+                    if self.cluster_of(nx, ny) not in corridor or not self.passable(nx, ny, width):
+                        continue
+                    new_cost = cost + 1
+                    if new_cost < best.get((nx, ny), float('inf')):
+                        best[(nx, ny)] = new_cost
+                        came_from[(nx, ny)] = node
+                        heapq.heappush(frontier, (new_cost + gen.heuristic((nx, ny), end), new_cost, (nx, ny)))
+
+        return None
+
+    def compare_with_flat(self, width):
+        """
+        Plans the same width with this planner and with run_weighted_astar at
+        tolerance 0, and returns lengths, scores and timings side by side.
+        """
+        gen = self.map_gen
+
+        t0 = time.perf_counter()
+        hier_path = self.plan(width)
+        hier_time = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        flat_path, _ = gen.run_weighted_astar(width, 0)
+        flat_time = time.perf_counter() - t0
+
+        hier_len = len(hier_path) if hier_path else 0
+        flat_len = len(flat_path) if flat_path else 0
+        return {
+            'width': width,
+            'hier_length': hier_len,
+            'flat_length': flat_len,
+            'hier_score': gen.calculate_score(hier_len, width, 0),
+            'flat_score': gen.calculate_score(flat_len, width, 0),
+            'hier_time': hier_time,
+            'flat_time': flat_time,
+            'hier_expansions': self.last_expansions,
+        }
@@ -2,7 +2,11 @@ import pygame
 import math
 import time
 import random
+import numpy as np
+import calcs
 from generateMap import IARCMapGenerator
+from solutionCache import SolutionCache
+from profiler import FrameProfiler, profile_call
 from text import drawText
 from fontDict import fonts
 
@@ -26,6 +30,9 @@ font_regular = fonts[f"regular{int(25 / (SCALE_DOWN_FACTOR ** (1 / 1.5)))}"]
 font_bold = fonts[f"bold{int(25 / (SCALE_DOWN_FACTOR ** (1 / 1.5)))}"]
 font_bold15 = fonts[f"bold{int(15 / (SCALE_DOWN_FACTOR ** (1 / 1.5)))}"]
 
+# F3 toggles the timing graph, F5 dumps a cProfile of one solve
+profiler = FrameProfiler(history=240)
+
 
 class Endesga:
     maroon_red = [87, 28, 39]
@@ -61,19 +68,63 @@ tile_colors = {
 
 # ---------------- Map Logic
 map_gen = IARCMapGenerator()
+map_gen.solution_cache = SolutionCache(max_entries=64)
+map_gen.record_expansions = True
 
 # Parameters
 p_mines_total = 135
 p_hidden_rate = 0.05
 p_num_trees = 12
 
+# Re-rolled with G; the same seed + parameters always rebuild the same map,
+# so flipping M/N/P/O/K/L back to a previous setting is a cache hit
+map_seed = random.randrange(1 << 30)
+
+# H cycles the heatmap drawn under the tiles
+heatmap_modes = [None, "visible field", "all field", "expansions"]
+heatmap_mode = 0
+heatmap_colors = [Endesga.my_blue, Endesga.grey_blue, Endesga.cream, Endesga.debug_red]
+heatmap_cache = {}  # (mode, tile_size) -> scaled surface, cleared on every solve
+path_strokes = {}  # (tolerance, tile_size, color) -> path polyline surface, cleared on every solve
+
+
+def get_path_stroke(t_idx, tile_size, color=Endesga.white):
+    key = (t_idx, tile_size, tuple(color))
+    if key not in path_strokes:
+        path = map_gen.solutions[t_idx]['path'] if map_gen.solutions[t_idx]['found'] else []
+        path_strokes[key] = calcs.createPathStrokeSurface(pygame, path, tile_size, color, tile_size,
+                                                          (map_gen.WIDTH * tile_size, map_gen.HEIGHT * tile_size))
+    return path_strokes[key]
+
+
+def get_heatmap(mode, tile_size):
+    key = (mode, tile_size)
+    if key not in heatmap_cache:
+        if mode == "expansions":
+            counts = map_gen.expansion_counts
+            field = np.log1p(counts) if counts is not None else np.zeros((map_gen.HEIGHT, map_gen.WIDTH))
+        else:
+            source = map_gen.distance_field_visible if mode == "visible field" else map_gen.distance_field_all
+            # Hot next to mines, fading out just past the widest corridor checked
+            cap = map_gen.MAX_PATH_WIDTH + 1
+            field = cap - np.minimum(map_gen.field_array(source), cap)
+        rgb = calcs.linearGradientArray(heatmap_colors, field / max(field.max(), 1e-9))
+        surface = pygame.surfarray.make_surface(rgb.swapaxes(0, 1))
+        heatmap_cache[key] = pygame.transform.scale(surface, (map_gen.WIDTH * tile_size, map_gen.HEIGHT * tile_size))
+    return heatmap_cache[key]
+
+
 # Store data for 3 scenarios: [Tolerance 0, Tolerance 1, Tolerance 2]
 maps_data = []  # List of tuples: (grid, violations, score, width, found)
 
 
 def run_solver():
     global maps_data
+    profiler.start("solve")
+    heatmap_cache.clear()
+    path_strokes.clear()
     # 1. Generate & Solve
+    random.seed(hash((map_seed, p_mines_total, round(p_hidden_rate, 2), p_num_trees)))
     map_gen.generate_base_map(
         num_trees=p_num_trees,
         num_mines=p_mines_total,
@@ -87,6 +138,7 @@ def run_solver():
     for t in range(3):
         data = map_gen.get_render_data_for_tolerance(t)
         maps_data.append(data)
+    profiler.stop("solve")
 
 
 # Initial Load
@@ -119,6 +171,7 @@ while running:
                 toggle_ui = not toggle_ui
 
             if event.key == pygame.K_g:
+                map_seed = random.randrange(1 << 30)
                 run_solver()
 
             if event.key == pygame.K_m:
@@ -145,6 +198,17 @@ while running:
             if event.key == pygame.K_r:
                 scroll = [0, 0]
 
+            if event.key == pygame.K_h:
+                heatmap_mode = (heatmap_mode + 1) % len(heatmap_modes)
+
+            if event.key == pygame.K_F3:
+                profiler.visible = not profiler.visible
+            if event.key == pygame.K_F5:
+                # A cache hit would profile nothing, so bypass the cache for this solve
+                cache, map_gen.solution_cache = map_gen.solution_cache, None
+                profile_call(f"solve_{int(time.time())}.prof", run_solver)
+                map_gen.solution_cache = cache
+
         if event.type == pygame.MOUSEBUTTONDOWN:
             if event.button in [1, 2]:
                 click = True
@@ -198,20 +262,27 @@ while running:
 
         # 1. Draw Header Info
         header_text = f"TOLERANCE: {t_idx}  |  PATH WIDTH: {width}  |  SCORE: {int(score)}  |  VIOLATIONS: {violations}"
-        if not found: header_text += " [NO PATH]"
+        if not found: header_text += f" [NO PATH: {map_gen.solutions[t_idx].get('reason')}]"
 
         col = Endesga.white
         if violations > t_idx: col = Endesga.orange_bright  # Actual > Allowed
 
+        profiler.start("text")
         drawText(screenUI, col, font_bold15, start_x + scroll[0], current_y, header_text)
+        profiler.stop("text")
         current_y += HEADER_H
 
+        profiler.start("tiles")
+
         # 2. Draw Map Tiles
         draw_solid = []
         draw_trans = []
 
         start_y_map = current_y
 
+        if heatmap_modes[heatmap_mode]:
+            screen2.blit(get_heatmap(heatmap_modes[heatmap_mode], tile_size), (start_x + scroll[0], start_y_map))
+
         for r_idx, row in enumerate(grid):
             for c_idx, tile_id in enumerate(row):
                 if tile_id != 0:
@@ -228,30 +299,43 @@ while running:
                             draw_trans.append((r, Endesga.danger_hid_color))
                         elif tile_id == 8:
                             draw_trans.append((r, Endesga.sacrificed_color))
+                        elif tile_id == 1:
+                            pass  # Safe path is blitted as one stroke below
                         else:
                             draw_solid.append((r, tile_id))
 
         if tile_size > 2:
             for r, tid in draw_solid:
                 pygame.draw.rect(screen2, Endesga.greyVD, (r.x - r.width / 6, r.y + r.height / 4, r.width, r.height))
+            # The path gets the same drop shadow as the other solid tiles
+            if found:
+                screen2.blit(get_path_stroke(t_idx, tile_size, Endesga.greyVD),
+                             (start_x + scroll[0] - tile_size / 6, start_y_map + tile_size / 4))
 
         for r, tid in draw_solid:
             color = tile_colors.get(tid, Endesga.debug_red)
             pygame.draw.rect(screen2, color, r)
 
+        if found:
+            screen2.blit(get_path_stroke(t_idx, tile_size), (start_x + scroll[0], start_y_map))
+
         for r, col in draw_trans:
             pygame.draw.rect(screenT, col, r)
+        profiler.stop("tiles")
 
         # Increment Y for next map
         current_y += (MAP_H * tile_size) + PADDING
 
     # ---------------- Render UI Overlay
     if toggle_ui:
+        profiler.start("text")
         infos = [
             f"FPS: {int(clock.get_fps())}",
             f"Mines: {p_mines_total} (M/N)",
             f"Hidden: {int(p_hidden_rate * 100)}% (P/O)",
             f"Trees: {p_num_trees} (K/L)",
+            f"Cache: {int(map_gen.solution_cache.hit_rate() * 100)}% hit, {map_gen.solution_cache.memory_bytes // 1024} KB",
+            f"Heatmap: {heatmap_modes[heatmap_mode] or 'off'} (H)",
         ]
         ui_y = 10
         for info in infos:
@@ -283,10 +367,17 @@ while running:
         pygame.mouse.set_visible(False)
         pygame.draw.circle(screenUI, Endesga.black, (mx_sc + 1, my_sc + 1), 3, 1)
         pygame.draw.circle(screenUI, Endesga.white, (mx_sc, my_sc), 3, 1)
+        profiler.stop("text")
+
+    if profiler.visible:
+        profiler.draw(pygame, screenUI, font_regular, 10, screen_height - 140, width=200, height=60)
 
+    profiler.start("scale")
     screen.blit(pygame.transform.scale(screen2, (screen.get_width(), screen.get_height())), (0, 0))
     screen.blit(pygame.transform.scale(screenT, (screen.get_width(), screen.get_height())), (0, 0))
     screen.blit(pygame.transform.scale(screenUI, (screen.get_width(), screen.get_height())), (0, 0))
+    profiler.stop("scale")
 
     pygame.display.flip()
+    profiler.end_frame()
     clock.tick(FPS)
\ No newline at end of file
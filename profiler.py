@@ -0,0 +1,105 @@
+import time
+import pstats
+import cProfile
+import contextlib
+import collections
+
+# Line colors for the on-screen graph, cycled in section order
+SECTION_COLORS = [(255, 96, 141), (237, 171, 80), (64, 200, 120), (90, 160, 255), (200, 120, 255), (255, 255, 255)]
+
+
+class FrameProfiler:
+    """
+    Named timing sections with a ring buffer of per-frame history.
+
+    Wrap work in `with profiler.section("name"):` (or start/stop); time spent in
+    a section is summed until end_frame() pushes one sample (ms) per section into its
+    history. Nothing here needs a display, so headless runs call end_frame()
+    after each unit of work and read summary()/report().
+    """
+
+    def __init__(self, history=240):
+        self.history = history
+        self.samples = {}
+        self.current = collections.defaultdict(float)
+        self.started = {}
+        self.visible = False
+
+    @contextlib.contextmanager
+    def section(self, name):
+        self.start(name)
+        try:
+            yield
+        finally:
+            self.stop(name)
+
+    def start(self, name):
+        self.started[name] = time.perf_counter()
+
+    def stop(self, name):
+        self.current[name] += (time.perf_counter() - self.started.pop(name)) * 1000
+
+    def end_frame(self):
+        for name in self.samples:
+            if name not in self.current:
+                self.samples[name].append(0.0)
+        for name, ms in self.current.items():
+            if name not in self.samples:
+                self.samples[name] = collections.deque(maxlen=self.history)
+            self.samples[name].append(ms)
+        self.current.clear()
+
+    def percentile(self, name, p):
+        values = sorted(self.samples.get(name, ()))
+        if not values: return 0
+        return values[min(len(values) - 1, int(p * len(values)))]
+
+    def summary(self):
+        """
+        Returns {section: (p50_ms, p99_ms, last_ms)}.
+        """
+        return {name: (self.percentile(name, 0.5), self.percentile(name, 0.99), values[-1] if values else 0)
+                for name, values in self.samples.items()}
+
+    def report(self):
+        return "\n".join(f"{name:>10}: p50 {p50:6.2f} ms  p99 {p99:6.2f} ms  last {last:6.2f} ms"
+                         for name, (p50, p99, last) in self.summary().items())
+
+    def draw(self, pygame, surface, font, x, y, width=200, height=50, textColor=(255, 255, 255)):
+        """
+        Draws one history line per section plus a p50/p99 label row for each.
+
+        Parameters:
+          pygame: base library
+          surface: target surface.
+          font: pygame font for the labels.
+          x, y: top-left corner of the graph.
+          width, height: graph size in pixels.
+        """
+        # Scale to sections that run every frame so a rare solve spike does not flatten them
+        scale_ms = max([self.percentile(name, 0.99) for name in self.samples if self.percentile(name, 0.5) > 0] + [1])
+
+        pygame.draw.rect(surface, (0, 0, 0, 140), (x, y, width, height))
+        for i, (name, values) in enumerate(self.samples.items()):
+            color = SECTION_COLORS[i % len(SECTION_COLORS)]
+            if len(values) > 1:
+                step = width / (self.history - 1)
+                points = [(x + j * step, y + height - min(1, v / scale_ms) * height) for j, v in enumerate(values)]
+                pygame.draw.lines(surface, color, False, points)
+
+            p50, p99 = self.percentile(name, 0.5), self.percentile(name, 0.99)
+            label_y = y + height + 2 + i * (font.get_height() + 1)
+            pygame.draw.rect(surface, color, (x, label_y + font.get_height() // 3, 6, 6))
+            surface.blit(font.render(f"{name}: {p50:.1f} / {p99:.1f} ms", False, textColor), (x + 10, label_y))
+
+
+def profile_call(path, fn, *args, **kwargs):
+    """
+    Runs fn under cProfile, dumps the stats to path and prints the top entries.
+    Returns fn's result.
+    """
+    profile = cProfile.Profile()
+    result = profile.runcall(fn, *args, **kwargs)
+    profile.dump_stats(path)
+    pstats.Stats(profile).sort_stats("cumulative").print_stats(15)
+    return result
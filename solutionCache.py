@@ -0,0 +1,118 @@
+import os
+import pickle
+import hashlib
+import collections
+
+
+class SolutionCache:
+    """
+    Memoizes solve_all_scenarios results keyed by map content.
+
+    Entries are kept pickled, so every get returns a fresh copy that callers
+    may change without touching the cache.
+
+    Parameters:
+      max_entries: Number of entries kept in the in-memory LRU.
+      disk_dir: Optional directory for a pickled on-disk tier.
+    """
+
+    def __init__(self, max_entries=64, disk_dir=None):
+        self.max_entries = max_entries
+        self.disk_dir = disk_dir
+
+        # key -> pickled solutions, oldest first
+        self.entries = collections.OrderedDict()
+        self.memory_bytes = 0
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        if self.disk_dir:
+            os.makedirs(self.disk_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(map_gen, widths, tolerances, mode="sweep"):
+        h = hashlib.sha1()
+        for row in map_gen.grid:
+            h.update(bytes(row))
+        # Mine ids in 'sacrificed' depend on the order mines were placed
+        for mx, my in map_gen.mines_visible:
+            h.update(mx.to_bytes(2, "little") + my.to_bytes(2, "little"))
+        h.update(repr((map_gen.start_node, map_gen.end_node, tuple(widths), tuple(tolerances), mode)).encode())
+        return h.hexdigest()
+
+    def get(self, key):
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return pickle.loads(self.entries[key])
+
+        if self.disk_dir:
+            path = self._disk_path(key)
+            if os.path.exists(path):
+                with open(path, "rb") as f:
+                    blob = f.read()
+                # A file that fails to load (e.g. left truncated by a crash) counts as a miss
+                try:
+                    solutions = pickle.loads(blob)
+                except Exception:
+                    solutions = None
+                if solutions is not None:
+                    self._store(key, blob)
+                    self.hits += 1
+                    self.disk_hits += 1
+                    return solutions
+
+        self.misses += 1
+        return None
+
+    def put(self, key, solutions):
+        blob = pickle.dumps(solutions, protocol=pickle.HIGHEST_PROTOCOL)
+        self._store(key, blob)
+
+        if self.disk_dir:
+            # Write beside the target and swap it in, so readers never see a partial file
+            path = self._disk_path(key)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(blob)
+            os.replace(tmp_path, path)
+
+    def clear(self):
+        self.entries.clear()
+        self.memory_bytes = 0
+
+    def hit_rate(self):
+        total = self.hits + self.misses
+        if total == 0: return 0
+        return self.hits / total
+
+    def disk_bytes(self):
+        if not self.disk_dir:
+            return 0
+        return sum(entry.stat().st_size for entry in os.scandir(self.disk_dir) if entry.name.endswith(".pkl"))
+
+    def stats(self):
+        return {
+            'hits': self.hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+            'hit_rate': self.hit_rate(),
+            'entries': len(self.entries),
+            'memory_bytes': self.memory_bytes,
+            'disk_bytes': self.disk_bytes(),
+        }
+
+    def _store(self, key, blob):
+        if key in self.entries:
+            self.memory_bytes -= len(self.entries.pop(key))
+        self.entries[key] = blob
+        self.memory_bytes += len(blob)
+
+        while len(self.entries) > self.max_entries:
+            _, old_blob = self.entries.popitem(last=False)
+            self.memory_bytes -= len(old_blob)
+
+    def _disk_path(self, key):
+        return os.path.join(self.disk_dir, f"{key}.pkl")